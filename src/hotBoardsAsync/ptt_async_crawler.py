@@ -4,23 +4,90 @@
 """
 
 import asyncio
-import aiofiles
+import aiohttp
 import csv
-import re
-from datetime import datetime
+import functools
+import io
+import orjson
+from datetime import datetime, timezone
 from typing import List, Dict, Optional, Tuple
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from lxml import etree
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-import json
 
 # 設定常數
+PTT_BASE = 'https://www.ptt.cc'
 NUM_BOARDS = 50
 ARTICLES_PER_BOARD = 100
 CONCURRENT_BOARDS = 5
 CONCURRENT_ARTICLES = 10
+CONCURRENT_REQUESTS = CONCURRENT_BOARDS * CONCURRENT_ARTICLES  # 所有看板共用的文章請求上限
 PAGE_TIMEOUT = 30000
 REQUEST_DELAY = 1
 MAX_RETRIES = 2  # 最大重試次數
 RETRY_DELAY = 3  # 重試延遲（秒）
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+PARSE_CHUNK_SIZE = 65536  # 串流解析每次餵入的大小
+HTTP_CACHE_NAME = 'ptt_cache.sqlite'  # HTTP 回應快取檔
+HTTP_CACHE_EXPIRE = 900  # 預設快取秒數（看板列表等常更新的頁面）
+ARTICLE_CACHE_EXPIRE = 86400  # 文章發布後很少變動，快取較久
+OUTPUT_CSV = 'ptt_all_improved.csv'  # 所有看板的文章寫入同一個檔案，以 board 欄位區分
+CSV_BATCH_SIZE = 50  # 串流寫入 CSV 時每批的筆數，小於單一看板文章數，爬取期間就會開始寫入
+CSV_QUEUE_SIZE = CSV_BATCH_SIZE * 4  # 寫入佇列上限，寫入跟不上時讓抓取端等待，避免資料堆在記憶體
+CSV_FIELDS = ['title', 'link', 'author', 'date', 'board',
+              'content', 'pushes', 'status', 'crawl_time', 'from_cache', 'retry_count', 'error']
+CDP_ENDPOINT = None  # 常駐 Chromium 的 CDP 位址，例如 'http://localhost:9222'；None 時每次自行啟動
+
+# 在瀏覽器內一次取出列表資料，避免逐一查詢元素造成大量 CDP 往返
+JS_HOTBOARDS = """() => Array.from(document.querySelectorAll('a.board')).map(e => ({
+    name: e.querySelector('div.board-name')?.textContent ?? null,
+    href: e.getAttribute('href')
+}))"""
+JS_BOARD_POSTS = """() => Array.from(document.querySelectorAll('.r-ent')).map(e => ({
+    title: e.querySelector('.title a')?.textContent ?? null,
+    href: e.querySelector('.title a')?.getAttribute('href') ?? null,
+    author: e.querySelector('.author')?.textContent ?? '',
+    date: e.querySelector('.date')?.textContent ?? ''
+}))"""
+
+@functools.lru_cache(maxsize=None)
+def canon_board_url(url: str) -> str:
+    """將看板網址正規化為 index.html 入口，同一看板只計算一次"""
+    if url.endswith('.html'):
+        return url
+    return url.rstrip('/') + '/index.html'
+
+class ArticleStreamParser:
+    """以 HTMLPullParser 邊接收邊解析文章頁，#main-content 結束後即停止"""
+
+    def __init__(self):
+        self._parser = etree.HTMLPullParser(events=('end',))
+        self.content = ''
+        self.pushes = 0
+        self.done = False
+
+    def feed(self, chunk) -> bool:
+        """餵入一段 HTML，回傳是否已取得所需欄位"""
+        self._parser.feed(chunk)
+        self._read_events()
+        return self.done
+
+    def close(self):
+        """資料結束時收尾，處理剩餘的事件"""
+        if not self.done:
+            self._parser.close()
+            self._read_events()
+
+    def _read_events(self):
+        for _, elem in self._parser.read_events():
+            # 推文都在 #main-content 內，因此它結束時推文數也已確定
+            if elem.get('id') == 'main-content':
+                # HTMLPullParser 產生的是 etree._Element，沒有 lxml.html 的 text_content()
+                self.content = ''.join(elem.itertext())
+                self.done = True
+                return
+            if 'push' in (elem.get('class') or '').split():
+                self.pushes += 1
 
 class PTTPlaywrightCrawler:
     """PTT Playwright 非同步爬蟲類別"""
@@ -29,12 +96,15 @@ class PTTPlaywrightCrawler:
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._http_session: Optional[CachedSession] = None
         self.stats = {
             'boards_processed': 0,
             'articles_crawled': 0,
             'articles_failed': 0,
             'articles_retried': 0,
             'errors': 0,
+            'csv_rows_dropped': 0,
             'start_time': None,
             'end_time': None
         }
@@ -54,22 +124,31 @@ class PTTPlaywrightCrawler:
         
         self.playwright = await async_playwright().start()
         
+        # 優先連線到共用的常駐瀏覽器（以 --remote-debugging-port 啟動），省去冷啟動
+        if CDP_ENDPOINT:
+            try:
+                self.browser = await self.playwright.chromium.connect_over_cdp(CDP_ENDPOINT)
+                print(f"🔗 已連線到共用瀏覽器: {CDP_ENDPOINT}")
+            except Exception as e:
+                print(f"⚠️ 無法連線到共用瀏覽器，改為自行啟動: {e}")
+        
         # 啟動瀏覽器
-        self.browser = await self.playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-gpu',
-                '--no-first-run'
-            ]
-        )
+        if not self.browser:
+            self.browser = await self.playwright.chromium.launch(
+                headless=True,
+                args=[
+                    '--no-sandbox',
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-web-security',
+                    '--disable-features=VizDisplayCompositor',
+                    '--disable-gpu',
+                    '--no-first-run'
+                ]
+            )
         
-        # 建立瀏覽器上下文
+        # 建立瀏覽器上下文（共用瀏覽器時每次執行也使用全新的上下文）
         self.context = await self.browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            user_agent=USER_AGENT,
             viewport={'width': 1920, 'height': 1080},
             ignore_https_errors=True
         )
@@ -82,21 +161,57 @@ class PTTPlaywrightCrawler:
             'path': '/'
         }])
         
+        # 可重用的分頁池，熱門看板與看板列表共用，避免每次都 new_page()/close()
+        self._page_pool = asyncio.Queue()
+        
+        # 文章頁是靜態 HTML，帶 over18 cookie 直接以 HTTP 抓取，不必經過瀏覽器；
+        # 回應存入 SQLite 快取，重複執行時未過期的頁面不必重新下載
+        self._http_session = CachedSession(
+            cache=SQLiteBackend(
+                HTTP_CACHE_NAME,
+                expire_after=HTTP_CACHE_EXPIRE,
+                urls_expire_after={'www.ptt.cc/bbs/*/M.*': ARTICLE_CACHE_EXPIRE}
+            ),
+            cookies={'over18': '1'},
+            headers={'User-Agent': USER_AGENT},
+            # aiohttp 預設就會保持長連線（keep-alive），同一主機的 TLS 連線會被重用；
+            # 不改用 httpx HTTP/2，以保留上面的 SQLite 回應快取
+            connector=aiohttp.TCPConnector(limit=CONCURRENT_REQUESTS),
+            timeout=aiohttp.ClientTimeout(total=PAGE_TIMEOUT / 1000)
+        )
+        
         print("✅ 瀏覽器設定完成")
 
     async def cleanup(self):
         """清理資源"""
         print("🧹 正在清理資源...")
         
+        if self._http_session:
+            await self._http_session.close()
         if self.context:
             await self.context.close()
         if self.browser:
+            # 透過 CDP 連線的瀏覽器只會中斷連線，不會關閉共用的 Chromium
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
         
         print("✅ 資源清理完成")
 
+    async def _acquire_page(self) -> Page:
+        """從分頁池取出分頁，池中沒有閒置分頁時才建立新的"""
+        try:
+            return self._page_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self.context.new_page()
+
+    async def _release_page(self, page: Page, reusable: bool = True):
+        """歸還分頁；出錯的分頁直接關閉，之後需要時再補新的"""
+        if reusable and not page.is_closed():
+            self._page_pool.put_nowait(page)
+        else:
+            await page.close()
+
     async def handle_page_setup(self, page: Page, retry_count: int = 0) -> bool:
         """處理頁面載入和年齡確認，增加重試機制"""
         try:
@@ -125,75 +240,70 @@ class PTTPlaywrightCrawler:
         """非同步獲取熱門看板"""
         print("🌐 正在獲取熱門看板...")
         
-        page = await self.context.new_page()
+        page = await self._acquire_page()
+        reusable = True
         
         try:
-            await page.goto('https://www.ptt.cc/bbs/hotboards.html', 
+            await page.goto(f'{PTT_BASE}/bbs/hotboards.html', 
                            wait_until='domcontentloaded', timeout=PAGE_TIMEOUT)
             
             if not await self.handle_page_setup(page):
+                reusable = False
                 return self.get_default_boards()
             
             # 等待看板列表載入
             await page.wait_for_selector('a.board', timeout=10000)
             
-            # 獲取看板列表
-            board_elements = await page.locator('a.board').all()
-            print(f"🔍 找到 {len(board_elements)} 個看板")
+            # 獲取看板列表（單次 evaluate 取回所有看板）
+            board_items = await page.evaluate(JS_HOTBOARDS)
+            print(f"🔍 找到 {len(board_items)} 個看板")
             
             boards = []
-            for element in board_elements[:NUM_BOARDS]:
-                try:
-                    board_name_elem = element.locator('div.board-name')
-                    if await board_name_elem.count() > 0:
-                        name = await board_name_elem.text_content()
-                        href = await element.get_attribute('href')
-                        
-                        if name and href:
-                            boards.append({
-                                'name': name.strip(),
-                                'url': 'https://www.ptt.cc' + href
-                            })
-                            
-                except Exception as e:
-                    print(f"⚠️ 解析看板元素錯誤: {e}")
-                    continue
+            for item in board_items[:NUM_BOARDS]:
+                name = item['name']
+                href = item['href']
+                if name and href:
+                    # 取得看板時就先正規化成 index.html 入口
+                    boards.append({
+                        'name': name.strip(),
+                        'url': canon_board_url(PTT_BASE + href)
+                    })
             
             print(f"✅ 成功獲取 {len(boards)} 個熱門看板")
             return boards if boards else self.get_default_boards()
             
         except Exception as e:
             print(f"❌ 獲取熱門看板失敗: {e}")
+            reusable = False
             return self.get_default_boards()
         finally:
-            await page.close()
+            await self._release_page(page, reusable)
 
     def get_default_boards(self) -> List[Dict[str, str]]:
         """預設看板列表"""
         default_boards = [
-            {'name': 'Gossiping', 'url': 'https://www.ptt.cc/bbs/Gossiping/'},
-            {'name': 'Stock', 'url': 'https://www.ptt.cc/bbs/Stock/'},
-            {'name': 'NBA', 'url': 'https://www.ptt.cc/bbs/NBA/'},
-            {'name': 'Baseball', 'url': 'https://www.ptt.cc/bbs/Baseball/'},
-            {'name': 'C_Chat', 'url': 'https://www.ptt.cc/bbs/C_Chat/'},
-            {'name': 'PC_Shopping', 'url': 'https://www.ptt.cc/bbs/PC_Shopping/'},
-            {'name': 'DC_SALE', 'url': 'https://www.ptt.cc/bbs/DC_SALE/'},
-            {'name': 'MobileComm', 'url': 'https://www.ptt.cc/bbs/MobileComm/'},
-            {'name': 'Lifeismoney', 'url': 'https://www.ptt.cc/bbs/Lifeismoney/'},
-            {'name': 'car', 'url': 'https://www.ptt.cc/bbs/car/'}
+            {'name': 'Gossiping', 'url': f'{PTT_BASE}/bbs/Gossiping/'},
+            {'name': 'Stock', 'url': f'{PTT_BASE}/bbs/Stock/'},
+            {'name': 'NBA', 'url': f'{PTT_BASE}/bbs/NBA/'},
+            {'name': 'Baseball', 'url': f'{PTT_BASE}/bbs/Baseball/'},
+            {'name': 'C_Chat', 'url': f'{PTT_BASE}/bbs/C_Chat/'},
+            {'name': 'PC_Shopping', 'url': f'{PTT_BASE}/bbs/PC_Shopping/'},
+            {'name': 'DC_SALE', 'url': f'{PTT_BASE}/bbs/DC_SALE/'},
+            {'name': 'MobileComm', 'url': f'{PTT_BASE}/bbs/MobileComm/'},
+            {'name': 'Lifeismoney', 'url': f'{PTT_BASE}/bbs/Lifeismoney/'},
+            {'name': 'car', 'url': f'{PTT_BASE}/bbs/car/'}
         ]
         print(f"📋 使用預設看板列表 ({len(default_boards)} 個)")
         return default_boards[:NUM_BOARDS]
 
     async def get_board_posts(self, board: Dict[str, str]) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
         """非同步獲取看板文章列表（支援多頁抓取）"""
-        page = await self.context.new_page()
+        page = await self._acquire_page()
+        reusable = True
         all_posts = []
         
         try:
-            current_url = board['url']
-            if not current_url.endswith('.html'):
-                current_url = current_url.rstrip('/') + '/index.html'
+            current_url = canon_board_url(board['url'])
             
             print(f"📄 {board['name']}: 開始多頁抓取，目標 {ARTICLES_PER_BOARD} 篇文章")
             
@@ -209,55 +319,35 @@ class PTTPlaywrightCrawler:
                     
                     if not await self.handle_page_setup(page):
                         print(f"   ❌ 第 {page_num} 頁設定失敗")
+                        reusable = False
                         break
                     
                     # 等待文章列表載入
                     await page.wait_for_selector('.r-ent', timeout=10000)
                     
-                    # 獲取文章列表
-                    article_elements = await page.locator('.r-ent').all()
-                    print(f"   📝 第 {page_num} 頁找到 {len(article_elements)} 個文章元素")
+                    # 獲取文章列表（單次 evaluate 取回整頁的標題、連結、作者、日期）
+                    article_items = await page.evaluate(JS_BOARD_POSTS)
+                    print(f"   📝 第 {page_num} 頁找到 {len(article_items)} 個文章元素")
                     
                     page_posts = []
-                    for element in article_elements:
-                        try:
-                            # 如果已經達到目標數量就停止
-                            if len(all_posts) >= ARTICLES_PER_BOARD:
-                                break
-                                
-                            # 獲取標題連結
-                            title_link = element.locator('.title a')
-                            if await title_link.count() == 0:
-                                # 可能是被刪除的文章或公告
-                                continue
-                            
-                            title = await title_link.text_content()
-                            href = await title_link.get_attribute('href')
-                            
-                            if not title or not href:
-                                continue
-                            
-                            # 獲取作者
-                            author_elem = element.locator('.author')
-                            author = await author_elem.text_content() if await author_elem.count() > 0 else ""
-                            
-                            # 獲取日期
-                            date_elem = element.locator('.date')
-                            date = await date_elem.text_content() if await date_elem.count() > 0 else ""
-                            
-                            post = {
-                                'title': title.strip(),
-                                'link': 'https://www.ptt.cc' + href,
-                                'author': author.strip(),
-                                'date': date.strip(),
-                                'board': board['name']
-                            }
-                            
-                            page_posts.append(post)
-                            
-                        except Exception as e:
-                            print(f"⚠️ 解析文章錯誤: {e}")
+                    for item in article_items:
+                        # 如果已經達到目標數量就停止
+                        if len(all_posts) >= ARTICLES_PER_BOARD:
+                            break
+                        
+                        # 沒有標題連結可能是被刪除的文章或公告
+                        title = item['title']
+                        href = item['href']
+                        if not title or not href:
                             continue
+                        
+                        page_posts.append({
+                            'title': title.strip(),
+                            'link': PTT_BASE + href,
+                            'author': item['author'].strip(),
+                            'date': item['date'].strip(),
+                            'board': board['name']
+                        })
                     
                     all_posts.extend(page_posts)
                     print(f"   ✅ 第 {page_num} 頁獲取 {len(page_posts)} 篇有效文章，累計 {len(all_posts)} 篇")
@@ -286,7 +376,7 @@ class PTTPlaywrightCrawler:
                         if prev_links:
                             href = await prev_links[0].get_attribute('href')
                             if href and href != current_url:  # 確保不是同一頁
-                                prev_page_link = f"https://www.ptt.cc{href}"
+                                prev_page_link = PTT_BASE + href
                                 print(f"   🔗 找到上一頁連結: {href}")
                         
                     except Exception as e:
@@ -308,6 +398,7 @@ class PTTPlaywrightCrawler:
                     
                 except Exception as e:
                     print(f"   ❌ 第 {page_num} 頁抓取失敗: {e}")
+                    reusable = False
                     break
             
             # 限制到目標數量
@@ -318,69 +409,63 @@ class PTTPlaywrightCrawler:
             
         except Exception as e:
             print(f"❌ 獲取 {board['name']} 文章失敗: {e}")
+            reusable = False
             return board, []
         finally:
-            await page.close()
+            # 出錯的分頁不放回池中，改由下次取用時建立新分頁
+            await self._release_page(page, reusable)
 
     async def get_article_detail_with_retry(self, sem: asyncio.Semaphore, post: Dict[str, str]) -> Dict[str, str]:
         """獲取文章詳細內容（帶重試機制）"""
         async with sem:
             for retry_count in range(MAX_RETRIES + 1):
                 try:
-                    page = await self.context.new_page()
+                    # 邊下載邊解析文章頁
+                    parser = ArticleStreamParser()
+                    async with self._http_session.get(post['link']) as response:
+                        response.raise_for_status()
+                        from_cache = getattr(response, 'from_cache', False)
+                        created_at = getattr(response, 'created_at', None) if from_cache else None
+                        async for chunk in response.content.iter_chunked(PARSE_CHUNK_SIZE):
+                            # 取得所需欄位後只讀完剩餘內容，讓連線可以重用
+                            if not parser.done:
+                                parser.feed(chunk)
+                    parser.close()
                     
-                    try:
-                        # 加載文章頁面
-                        await page.goto(post['link'], wait_until='domcontentloaded', timeout=PAGE_TIMEOUT)
-                        
-                        # 處理頁面設定（帶重試）
-                        if not await self.handle_page_setup(page, retry_count):
-                            if retry_count < MAX_RETRIES:
-                                print(f"🔄 重試 {post['title'][:30]}... (第{retry_count+1}次)")
-                                self.stats['articles_retried'] += 1
-                                await page.close()
-                                await asyncio.sleep(RETRY_DELAY)
-                                continue
-                            else:
-                                return {**post, 'content': '', 'pushes': 0, 'status': 'failed', 'retry_count': retry_count}
-                        
-                        # 等待主要內容載入
-                        await page.wait_for_selector('#main-content', timeout=15000)
-                        
-                        # 獲取文章內容
-                        main_content = page.locator('#main-content')
-                        if await main_content.count() > 0:
-                            content_text = await main_content.text_content()
-                            content = re.sub(r'\s+', ' ', content_text.strip()) if content_text else ""
-                        else:
-                            content = ""
-                        
-                        # 計算推文數
-                        push_elements = await page.locator('.push').all()
-                        pushes = len(push_elements)
-                        
-                        # 添加時間戳
+                    if not parser.done:
+                        # 快取會先存下任何 200 回應；內容不完整時移除，重試與下次執行才會重新下載
+                        await self._http_session.cache.delete_url(post['link'])
+                        raise ValueError("找不到文章主要內容 #main-content")
+                    
+                    # 合併連續空白（str.split 在 C 層完成，比 re.sub(r'\s+') 快約三倍）
+                    content = ' '.join(parser.content.split())
+                    
+                    # 添加時間戳；快取命中時記錄實際下載的時間（快取以 UTC 儲存），而非本次執行時間
+                    if created_at is not None:
+                        if created_at.tzinfo is None:
+                            created_at = created_at.replace(tzinfo=timezone.utc)
+                        timestamp = created_at.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+                    else:
                         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        
-                        result = {
-                            **post,
-                            'content': content[:1000],  # 限制內容長度
-                            'pushes': pushes,
-                            'status': 'success',
-                            'crawl_time': timestamp,
-                            'retry_count': retry_count
-                        }
-                        
-                        if retry_count > 0:
-                            print(f"✅ 重試成功: {post['title'][:30]} (第{retry_count+1}次嘗試)")
-                        
-                        # 請求間延遲
+                    
+                    result = {
+                        **post,
+                        'content': content[:1000],  # 限制內容長度
+                        'pushes': parser.pushes,
+                        'status': 'success',
+                        'crawl_time': timestamp,
+                        'from_cache': from_cache,
+                        'retry_count': retry_count
+                    }
+                    
+                    if retry_count > 0:
+                        print(f"✅ 重試成功: {post['title'][:30]} (第{retry_count+1}次嘗試)")
+                    
+                    # 請求間延遲（快取命中沒有送出請求，不必等待）
+                    if not from_cache:
                         await asyncio.sleep(REQUEST_DELAY)
-                        
-                        return result
-                        
-                    finally:
-                        await page.close()
+                    
+                    return result
                         
                 except Exception as e:
                     if retry_count < MAX_RETRIES:
@@ -403,37 +488,68 @@ class PTTPlaywrightCrawler:
             # 不應該到達這裡
             return {**post, 'content': '', 'pushes': 0, 'status': 'failed', 'retry_count': MAX_RETRIES}
 
-    async def save_data_async(self, filename: str, data: List[Dict]) -> bool:
-        """非同步儲存資料到 CSV"""
-        if not data:
-            print(f"⚠️ 沒有資料可儲存到 {filename}")
-            return False
+    @staticmethod
+    def _write_csv_rows_sync(filename: str, rows: List[Dict], write_header: bool):
+        """同步寫入一批 CSV 資料（在執行緒中執行），先在記憶體組好內容再一次寫入檔案"""
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS, extrasaction='ignore',
+                                quoting=csv.QUOTE_ALL, lineterminator='\n')
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
         
-        try:
-            # 使用 aiofiles 進行非同步檔案寫入
-            async with aiofiles.open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-                # 寫入標題行
-                keys = data[0].keys()
-                header = ','.join(f'"{key}"' for key in keys) + '\n'
-                await f.write(header)
-                
-                # 寫入資料行
-                for row in data:
-                    values = []
-                    for key in keys:
-                        value = str(row.get(key, '')).replace('"', '""')
-                        values.append(f'"{value}"')
-                    line = ','.join(values) + '\n'
-                    await f.write(line)
-                    
-            print(f"💾 已非同步儲存 {len(data)} 筆資料到 {filename}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ 儲存 CSV 錯誤: {e}")
-            return False
+        # 第一批建立新檔並寫入 BOM，之後的批次附加在檔尾
+        if write_header:
+            mode, encoding = 'w', 'utf-8-sig'
+        else:
+            mode, encoding = 'a', 'utf-8'
+        with open(filename, mode, encoding=encoding, newline='') as f:
+            f.write(buf.getvalue())
+
+    @staticmethod
+    def _save_json_sync(filename: str, data: Dict):
+        """同步寫入 JSON（在執行緒中執行），以 orjson 序列化成 UTF-8 位元組後一次寫入檔案"""
+        content = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with open(filename, 'wb') as f:
+            f.write(content)
+
+    async def csv_writer(self, queue: asyncio.Queue, filename: str) -> int:
+        """從佇列取出文章並分批寫入 CSV，收到 None 時結束，回傳寫入筆數"""
+        batch = []
+        written = 0
+        write_error = None
+        
+        # 寫入失敗後仍持續取出佇列資料直到收到 None，避免抓取端卡在已滿的佇列
+        while True:
+            item = await queue.get()
+            if item is not None:
+                batch.append(item)
+            
+            # 湊滿一批或資料結束時寫入，讓磁碟寫入與後續的網路請求重疊
+            if batch and (item is None or len(batch) >= CSV_BATCH_SIZE):
+                if write_error is None:
+                    try:
+                        await asyncio.to_thread(self._write_csv_rows_sync, filename, batch, written == 0)
+                        written += len(batch)
+                    except Exception as e:
+                        write_error = e
+                        print(f"❌ 儲存 CSV 錯誤: {e}，之後的資料將無法寫入")
+                if write_error is not None:
+                    self.stats['csv_rows_dropped'] += len(batch)
+                batch = []
+            
+            if item is None:
+                break
+        
+        if write_error is not None:
+            print(f"❌ {filename} 不完整：已寫入 {written} 筆，捨棄 {self.stats['csv_rows_dropped']} 筆")
+        elif written:
+            print(f"💾 已非同步儲存 {written} 筆資料到 {filename}")
+        else:
+            print(f"⚠️ 沒有資料可儲存到 {filename}")
+        return written
 
-    async def save_summary_async(self, boards_data: Dict) -> bool:
+    async def save_summary_async(self, boards_data: Dict[str, Dict[str, int]]) -> bool:
         """非同步儲存爬取摘要"""
         try:
             # 將 datetime 對象轉換為字符串
@@ -449,20 +565,12 @@ class PTTPlaywrightCrawler:
                 'boards': {}
             }
             
-            for board_name, articles in boards_data.items():
-                successful = len([a for a in articles if a.get('status') == 'success'])
-                failed = len([a for a in articles if a.get('status') in ['failed', 'error']])
-                retried = len([a for a in articles if a.get('retry_count', 0) > 0])
-                
-                summary['boards'][board_name] = {
-                    'total_articles': len(articles),
-                    'successful_articles': successful,
-                    'failed_articles': failed,
-                    'retried_articles': retried
-                }
-            
-            async with aiofiles.open('crawl_summary_improved.json', 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(summary, ensure_ascii=False, indent=2))
+            # 各看板的計數已在 process_board 中單次走訪累計
+            for board_name, counts in boards_data.items():
+                summary['boards'][board_name] = counts
+            
+            # 與 CSV 相同，在執行緒中一次寫入，不再經過 aiofiles 的開檔/寫入/關檔三次執行緒往返
+            await asyncio.to_thread(self._save_json_sync, 'crawl_summary_improved.json', summary)
                 
             print("📊 已儲存改進的爬取摘要到 crawl_summary_improved.json")
             return True
@@ -471,50 +579,77 @@ class PTTPlaywrightCrawler:
             print(f"❌ 儲存摘要錯誤: {e}")
             return False
 
-    async def process_board(self, sem: asyncio.Semaphore, board: Dict[str, str]) -> Tuple[str, List[Dict]]:
-        """非同步處理單一看板"""
-        async with sem:
+    async def fetch_article_to_queue(self, sem: asyncio.Semaphore, post: Dict[str, str],
+                                     queue: asyncio.Queue) -> Tuple[str, int]:
+        """獲取文章詳細內容，完成後立即交給 CSV 寫入佇列，只回傳狀態與重試次數"""
+        result = await self.get_article_detail_with_retry(sem, post)
+        await queue.put(result)
+        # 文章內容交給寫入任務後就不再保留，避免整次爬取的資料都留在記憶體
+        return result.get('status'), result.get('retry_count', 0)
+
+    async def process_board(self, board_sem: asyncio.Semaphore, request_sem: asyncio.Semaphore,
+                            queue: asyncio.Queue, board: Dict[str, str]) -> Tuple[str, Dict[str, int]]:
+        """非同步處理單一看板，回傳看板名稱與文章計數"""
+        # 看板信號量只限制文章列表抓取，詳細內容改由全域信號量控制，
+        # 避免慢速看板的尾端請求佔住看板名額
+        async with board_sem:
             print(f"🎯 開始處理看板: {board['name']}")
             
             try:
                 # 獲取文章列表
                 board_result, posts = await self.get_board_posts(board)
                 print(f"📋 {board['name']}: 找到 {len(posts)} 篇文章")
-                
-                if not posts:
-                    return board['name'], []
-                
-                # 獲取文章詳細內容
-                article_sem = asyncio.Semaphore(CONCURRENT_ARTICLES)
-                tasks = [self.get_article_detail_with_retry(article_sem, post) for post in posts]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # 過濾成功的結果
-                articles = []
-                for result in results:
-                    if isinstance(result, Exception):
-                        print(f"⚠️ 文章處理異常: {result}")
-                        self.stats['errors'] += 1
-                    else:
-                        articles.append(result)
-                        if result.get('status') == 'success':
-                            self.stats['articles_crawled'] += 1
-                        else:
-                            self.stats['articles_failed'] += 1
-                
-                self.stats['boards_processed'] += 1
-                successful_count = len([a for a in articles if a.get('status') == 'success'])
-                print(f"✅ {board['name']}: 成功處理 {successful_count}/{len(articles)} 篇文章")
-                
-                return board['name'], articles
-                
             except Exception as e:
                 print(f"❌ 處理看板 {board['name']} 時發生錯誤: {e}")
                 self.stats['errors'] += 1
-                return board['name'], []
+                return board['name'], {}
+        
+        if not posts:
+            return board['name'], {}
+        
+        try:
+            # 獲取文章詳細內容（與其他看板共用請求上限），完成後交給共用的 CSV 寫入佇列
+            tasks = [self.fetch_article_to_queue(request_sem, post, queue) for post in posts]
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            # 單次走訪累計所有計數，最後一次更新統計
+            total_count = successful_count = failed_count = retried_count = error_count = 0
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"⚠️ 文章處理異常: {result}")
+                    error_count += 1
+                    continue
+                
+                status, retry_count = result
+                total_count += 1
+                if status == 'success':
+                    successful_count += 1
+                else:
+                    failed_count += 1
+                if retry_count > 0:
+                    retried_count += 1
+            
+            self.stats['articles_crawled'] += successful_count
+            self.stats['articles_failed'] += failed_count
+            self.stats['errors'] += error_count
+            self.stats['boards_processed'] += 1
+            print(f"✅ {board['name']}: 成功處理 {successful_count}/{total_count} 篇文章")
+            
+            counts = {
+                'total_articles': total_count,
+                'successful_articles': successful_count,
+                'failed_articles': failed_count,
+                'retried_articles': retried_count
+            }
+            return board['name'], counts if total_count else {}
+            
+        except Exception as e:
+            print(f"❌ 處理看板 {board['name']} 時發生錯誤: {e}")
+            self.stats['errors'] += 1
+            return board['name'], {}
 
-    async def crawl_all_boards(self) -> Dict[str, List[Dict]]:
+    async def crawl_all_boards(self) -> Dict[str, Dict[str, int]]:
         """非同步爬取所有看板"""
         self.stats['start_time'] = datetime.now()
         print("🚀 開始非同步爬取所有看板...")
@@ -529,12 +664,21 @@ class PTTPlaywrightCrawler:
         print(f"📊 將處理 {len(boards)} 個看板，每個看板 {ARTICLES_PER_BOARD} 篇文章")
         print(f"🔄 設定重試機制：最多重試 {MAX_RETRIES} 次")
         
-        # 建立信號量控制並發數
+        # 建立信號量控制並發數（文章請求由所有看板共用同一個上限）
         board_sem = asyncio.Semaphore(CONCURRENT_BOARDS)
+        request_sem = asyncio.Semaphore(CONCURRENT_REQUESTS)
+        
+        # 所有看板的文章一完成就交給同一個寫入任務，CSV 寫入與其餘抓取同時進行
+        queue = asyncio.Queue(maxsize=CSV_QUEUE_SIZE)
+        writer_task = asyncio.create_task(self.csv_writer(queue, OUTPUT_CSV))
         
         # 並發處理所有看板
-        tasks = [self.process_board(board_sem, board) for board in boards]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [self.process_board(board_sem, request_sem, queue, board) for board in boards]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await queue.put(None)
+            await writer_task
         
         # 整理結果
         boards_data = {}
@@ -543,9 +687,9 @@ class PTTPlaywrightCrawler:
                 print(f"⚠️ 看板處理異常: {result}")
                 continue
             
-            board_name, articles = result
-            if articles:
-                boards_data[board_name] = articles
+            board_name, counts = result
+            if counts:
+                boards_data[board_name] = counts
         
         self.stats['end_time'] = datetime.now()
         return boards_data
@@ -562,17 +706,8 @@ class PTTPlaywrightCrawler:
                 print("⚠️ 沒有成功爬取任何資料")
                 return False
             
-            # 並發儲存所有資料
-            save_tasks = []
-            for board_name, articles in boards_data.items():
-                filename = f"{board_name}_improved.csv"
-                save_tasks.append(self.save_data_async(filename, articles))
-            
-            # 添加摘要儲存任務
-            save_tasks.append(self.save_summary_async(boards_data))
-            
-            # 等待所有儲存任務完成
-            save_results = await asyncio.gather(*save_tasks, return_exceptions=True)
+            # 文章已在爬取時串流寫入 OUTPUT_CSV，這裡只需儲存摘要
+            await self.save_summary_async(boards_data)
             
             # 顯示統計資訊
             elapsed = self.stats['end_time'] - self.stats['start_time']
@@ -585,6 +720,10 @@ class PTTPlaywrightCrawler:
             print(f"   🔄 重試文章: {self.stats['articles_retried']}")
             print(f"   💥 異常錯誤: {self.stats['errors']}")
             
+            if self.stats['csv_rows_dropped']:
+                print(f"❌ CSV 寫入失敗，{self.stats['csv_rows_dropped']} 筆資料未寫入 {OUTPUT_CSV}")
+                return False
+            
             return True
             
         except Exception as e:
@@ -609,4 +748,12 @@ async def main():
 
 if __name__ == '__main__':
     import sys
+
+    # 有安裝 uvloop 時改用 libuv 事件迴圈（Windows 不支援，維持預設）
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     sys.exit(asyncio.run(main()))